@@ -2,17 +2,54 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import functools
+import os
 import pathlib
+import random
 import sys
+import time
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Final, List, Tuple, TypeVar
 
-from dotenv import load_dotenv
-from google import genai
-from langchain.chat_models import init_chat_model
-from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+from response_cache import DiskCache, file_digest, text_sha256
+from video_split import probe_file, get_output_path, extract_audio
 
-from video_split import detect_video, get_output_path, extract_audio
+T = TypeVar('T')
+
+# The SDKs are heavy to import, so they are imported where they are first needed
+# and `--help` or argument errors return without loading them
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
+    from langchain_core.messages import HumanMessage
+
+SEPARATOR: Final[str] = '=' * 24
+MERGE_SIGN: Final[str] = f'\n{SEPARATOR}MERGED{SEPARATOR}\n'
+MERGE_SIGN_INFO: Final[str] = (
+    '\nFor your convenience, a merge sign has been added to the output file '
+    'to indicate where the continuation prompt was applied.'
+)
+TRUNCATED_FINISH_REASONS: Final[frozenset[str]] = frozenset({'MAX_TOKENS', 'SAFETY', 'BLOCKLIST', 'PROHIBITED_CONTENT'})
+WARNING_TEMPLATE: Final[str] = f'''
+        \n{SEPARATOR}
+        \nWARNING: {{task_type}} may be incomplete, as {{reason}}
+        {{merge_sign_info}}
+        \n{SEPARATOR}
+        '''
+
+
+@functools.lru_cache(maxsize=8)
+def get_model(model_name: str, temperature: float):
+    """Load the environment and create a chat model, once per model settings."""
+    from dotenv import load_dotenv
+    from langchain.chat_models import init_chat_model
+    
+    load_dotenv()
+    return init_chat_model(
+        model=model_name,
+        model_provider="google_genai",
+        temperature=temperature
+    )
 
 
 @dataclass
@@ -22,13 +59,32 @@ class TranscriptionConfig:
     model_name: str = 'gemini-2.5-flash'
     temperature: float = 0.20
     max_continuations: int = 10
-    separator : str = '='* 24
-    merge_sign: str = '\n' + separator + 'MERGED' + separator + '\n'
+    upload_poll_interval: float = 2.0
+    upload_max_wait: float = 600.0
+    use_context_cache: bool = True
+    context_cache_ttl: str = '3600s'
+    srt_buffer_size: int = 65536
+    max_retries: int = 8
+    retry_max_delay: float = 60.0
+    echo_flush_chars: int = 8192
+    echo_flush_interval: float = 0.025
+    separator: str = SEPARATOR
+    merge_sign: str = MERGE_SIGN
 
 class Prompts:
     """Container for system prompts and messages."""
     
-    DEFAULT_SYSTEM_MESSAGE = '''Input: Audio file of a podcast with Japanese language and multiple speakers.
+    DEFAULT_SYSTEM_MESSAGE = '''Transcribe the audio of a Japanese podcast with multiple speakers into a valid .srt file.
+
+Rules:
+1. Transcribe all spoken Japanese accurately.
+2. Diarize speakers. Start the first line of each subtitle block with `[Speaker Name]:` (e.g. `[Host]: こんにちは`). Use real names when stated or clearly inferable (e.g. `[Saki]`), otherwise consistent labels such as `[Speaker 1]`, `[Host]`, `[Guest]`.
+3. Break blocks at natural pauses or clause boundaries, never mid-word. Use at most 2 lines per block; for English, at most ~42 characters per line (excluding the speaker prefix) and 15-18 characters per second. Show each block for 1.5-7 seconds with precise timecodes.
+4. Mark significant non-speech audio in brackets (`[Music]`, `[Laughter]`, `[Applause]`, `[Silence]`) and unclear speech as `[unintelligible]`.
+5. Translate only when asked, into the requested language (English if unspecified), keeping the format and speaker labels.
+6. Output plain .srt only, without Markdown or backticks.'''
+
+    LEGACY_SYSTEM_MESSAGE = '''Input: Audio file of a podcast with Japanese language and multiple speakers.
 Output Format: A properly formatted .srt file, including speaker identification for each line of dialogue.
 
 Guidelines:
@@ -64,28 +120,77 @@ Guidelines:
 
     DEFAULT_TRANSLATION_PROMPT = "Translate the above content to {target_language}, output a proper .srt file."
 
+    DIRECT_TRANSLATION_PROMPT = "Transcribe the audio and translate it to {target_language}, output a proper .srt file."
+
+class ConsoleEcho:
+    """Buffer streamed text and write it to stdout in batches.
+    
+    Text is written once `max_chars` are pending, and by `flush_periodically`
+    every `interval` seconds, so it shows up even when the stream pauses.
+    """
+    
+    def __init__(self, max_chars: int, interval: float):
+        self.max_chars = max_chars
+        self.interval = interval
+        self.pending: List[str] = []
+        self.pending_chars = 0
+    
+    def write(self, text: str) -> None:
+        """Queue text, flushing once enough is pending."""
+        self.pending.append(text)
+        self.pending_chars += len(text)
+        if self.pending_chars >= self.max_chars:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write out all pending text."""
+        if self.pending:
+            sys.stdout.write("".join(self.pending))
+            sys.stdout.flush()
+            self.pending.clear()
+            self.pending_chars = 0
+    
+    async def flush_periodically(self) -> None:
+        """Flush pending text every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush()
+
 class AudioTranscriber:
     """Main class for audio transcription and translation functionality."""
     
-    TRUNCATED_FINISH_REASONS = ['MAX_TOKENS', 'SAFETY', 'BLOCKLIST', 'PROHIBITED_CONTENT']
+    RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+    RETRYABLE_ERROR_NAMES = {
+        'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'InternalServerError',
+        # httpx connection and timeout errors
+        'TransportError'
+    }
     
-    def __init__(self, config: TranscriptionConfig, disable_merge_sign: bool = False):
+    def __init__(self, config: TranscriptionConfig, disable_merge_sign: bool = False, echo: bool = True,
+                 cache: DiskCache | None = None):
         self.config = config
         self.disable_merge_sign = disable_merge_sign
+        self.echo = echo
+        self.cache = cache
         self.model = self._initialize_model()
+        self._genai_client: genai.Client | None = None
     
     def _initialize_model(self):
         """Initialize the language model."""
-        load_dotenv()
-        return init_chat_model(
-            model=self.config.model_name,
-            model_provider="google_genai",
-            temperature=self.config.temperature
-        )
+        return get_model(self.config.model_name, self.config.temperature)
+    
+    def _get_genai_client(self) -> genai.Client:
+        """Return the shared Gemini client, creating it on first use."""
+        if self._genai_client is None:
+            from google import genai
+            self._genai_client = genai.Client()
+        return self._genai_client
     
     @staticmethod
     def create_audio_message(audio_uri: str, mime_type: str) -> HumanMessage:
         """Create an audio message for the model."""
+        from langchain_core.messages import HumanMessage
+        
         return HumanMessage(content=[{
             "type": "media",
             "file_uri": audio_uri,
@@ -93,149 +198,474 @@ class AudioTranscriber:
         }])
 
 
-    def get_warning_message(self, continuation_count: int, task_type: str = "Transcription") -> str:
+    def get_warning_message(self, continuation_count: int, task_type: str = "Transcription",
+                            resume_count: int = 0) -> str:
         """Generate a warning message for incomplete transcriptions."""
-        merge_sign_info = (
-            '\nFor your convenience, a merge sign has been added to the output file '
-            'to indicate where the continuation prompt was applied.'
-            if not self.disable_merge_sign else ''
+        reasons = []
+        if continuation_count:
+            reasons.append(f"a token limit was reached {continuation_count} time(s)")
+        if resume_count:
+            reasons.append(f"the response stream was interrupted and resumed {resume_count} time(s)")
+        return WARNING_TEMPLATE.format(
+            task_type=task_type,
+            reason=" and ".join(reasons),
+            merge_sign_info='' if self.disable_merge_sign else MERGE_SIGN_INFO
         )
-        
-        return f'''
-        \n{self.config.separator}
-        \nWARNING: {task_type} may be incomplete, as a token limit was reached {continuation_count} time(s)
-        {merge_sign_info}
-        \n{self.config.separator}
-        '''
     
     @staticmethod
-    def is_response_truncated(finish_reason: str) -> bool:
-        """Check if the response was truncated based on the finish reason."""
-        return finish_reason in AudioTranscriber.TRUNCATED_FINISH_REASONS
+    def is_retryable_error(error: BaseException | None) -> bool:
+        """Check if an error, or any error it wraps, is a rate limit or transient server error."""
+        while error is not None:
+            if any(cls.__name__ in AudioTranscriber.RETRYABLE_ERROR_NAMES for cls in type(error).__mro__):
+                return True
+            code = getattr(error, 'code', None)
+            if isinstance(code, int) and code in AudioTranscriber.RETRYABLE_STATUS_CODES:
+                return True
+            error = error.__cause__ or error.__context__
+        return False
+    
+    def get_retry_delay(self, retry_count: int) -> float:
+        """Exponential backoff with jitter for the given retry attempt."""
+        return min(2 ** retry_count + random.random(), self.config.retry_max_delay)
+    
+    async def call_with_retries(self, operation: Callable[[], Awaitable[T]], description: str) -> T:
+        """Await `operation()`, retrying rate limit and transient errors with backoff."""
+        retry_count = 0
+        while True:
+            try:
+                return await operation()
+            except Exception as e:
+                if not self.is_retryable_error(e) or retry_count >= self.config.max_retries:
+                    raise
+                retry_count += 1
+                delay = self.get_retry_delay(retry_count)
+                print(f"[{description} failed: {e}. Retrying in {delay:.1f}s ({retry_count}/{self.config.max_retries})...]")
+                await asyncio.sleep(delay)
     
     @staticmethod
-    def prepare_file(file_path: str) -> str:
-        """Prepare the input file, extracting audio from video if necessary."""
-        if not detect_video(file_path):
+    async def prepare_file(file_path: pathlib.Path) -> pathlib.Path:
+        """Prepare the input file, extracting audio from video if necessary.
+        
+        Container probing and remuxing block, so they run in a worker thread.
+        """
+        has_video, audio_codec = await asyncio.to_thread(probe_file, file_path)
+        if not has_video:
             return file_path
+        if audio_codec is None:
+            raise RuntimeError(f"No audio stream found in '{file_path}'")
         
-        output_audio = get_output_path(file_path)
+        output_audio = get_output_path(file_path, audio_codec)
         print(f"Video detected, extracting audio to '{output_audio}'...")
-        extract_audio(file_path, output_audio)
-        return output_audio
+        if not await asyncio.to_thread(extract_audio, file_path, output_audio):
+            raise RuntimeError(f"Audio extraction from '{file_path}' failed")
+        return pathlib.Path(output_audio)
     
-    async def upload_audio(self, audio_file: str | pathlib.Path) -> HumanMessage:
-        """Upload an audio file and return an audio message."""
-        client = genai.Client()
-        print("Uploading audio file...")
+    async def upload_only(self, audio_file: str | pathlib.Path) -> types.File:
+        """Upload an audio file to the Gemini Files API without waiting for it to be processed."""
+        client = self._get_genai_client()
+        print(f"Uploading audio file '{audio_file}'...")
+        return await client.aio.files.upload(file=audio_file)
+    
+    async def await_ready(self, uploaded_file: types.File) -> HumanMessage:
+        """Poll an uploaded file until it is ready and return an audio message.
+        
+        Raises TimeoutError if the file is still processing after `upload_max_wait` seconds,
+        so a stuck upload doesn't hold its concurrency slot forever.
+        """
+        from google.genai import types
         
-        uploaded_file = await client.aio.files.upload(file=audio_file)
+        client = self._get_genai_client()
+        deadline = time.monotonic() + self.config.upload_max_wait
         file_data = await client.aio.files.get(name=uploaded_file.name)
         
+        while file_data.state == types.FileState.PROCESSING:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Uploaded file '{file_data.name}' was still processing "
+                                   f"after {self.config.upload_max_wait:.0f}s")
+            await asyncio.sleep(self.config.upload_poll_interval)
+            file_data = await client.aio.files.get(name=uploaded_file.name)
+        
+        if file_data.state == types.FileState.FAILED:
+            raise RuntimeError(f"Processing of uploaded file '{file_data.name}' failed")
+        
         print(f"Audio file uploaded successfully: {file_data.uri}\n")
         return self.create_audio_message(file_data.uri, file_data.mime_type)
     
+    async def upload_audio(self, audio_file: str | pathlib.Path) -> HumanMessage:
+        """Upload an audio file and return an audio message."""
+        # Retried separately, so a failed status poll doesn't upload the file again
+        uploaded_file = await self.call_with_retries(lambda: self.upload_only(audio_file), 'Upload')
+        return await self.call_with_retries(lambda: self.await_ready(uploaded_file), 'Upload status check')
+    
+    async def transcript_cache_key(self, filename: pathlib.Path, system_message: str = None) -> str:
+        """Build the cache key of a transcription from the audio content, prompt, model and merge sign settings."""
+        if system_message is None:
+            system_message = Prompts.DEFAULT_SYSTEM_MESSAGE
+        # Hashing a large file would block the event loop, so it runs in a worker thread
+        audio_digest = await asyncio.to_thread(file_digest, filename)
+        return DiskCache.make_key(
+            'transcript', audio_digest, text_sha256(system_message),
+            self.config.model_name, str(self.config.temperature), str(self.disable_merge_sign)
+        )
+    
+    def translation_cache_key(self, source: str, target_language: str) -> str:
+        """Build the cache key of a translation from its source (transcript or audio key) and target language."""
+        return DiskCache.make_key(
+            'translation', text_sha256(source), target_language,
+            self.config.model_name, str(self.config.temperature), str(self.disable_merge_sign)
+        )
+    
+    async def is_transcript_cached(self, filename: pathlib.Path, system_message: str = None) -> bool:
+        """Check whether a transcription of the file is already cached."""
+        if self.cache is None:
+            return False
+        return self.cache.get(await self.transcript_cache_key(filename, system_message)) is not None
+    
     async def save_to_srt(self, transcript_data: str, filename: pathlib.Path, task_type: str = 'Transcript') -> None:
         """Save transcript data to an SRT file."""
+        import aiofiles
+        
         output_filename = filename.with_suffix(".srt")
         
-        with open(output_filename, "w", encoding='utf-8') as f:
-            f.write(transcript_data)
+        async with aiofiles.open(output_filename, "w", encoding='utf-8',
+                                 buffering=self.config.srt_buffer_size) as f:
+            await f.write(transcript_data)
         
+        self.report_saved(output_filename, task_type)
+    
+    @staticmethod
+    def get_translation_path(filename: pathlib.Path, target_language: str) -> pathlib.Path:
+        """Return the SRT path of a translation, next to the source file."""
+        lang_suffix = target_language.lower().replace(' ', '_')
+        return filename.with_name(f"{filename.stem}_{lang_suffix}.srt")
+    
+    def report_saved(self, output_filename: pathlib.Path, task_type: str = 'Transcript') -> None:
+        """Print where an SRT file was saved."""
         print(f"{task_type} saved to {output_filename}")
         print(self.config.separator)
     
-    async def get_complete_response(self, messages: List) -> Tuple[List, int]:
-        """Get a complete response with automatic continuation handling."""
-        complete_response = ""
-        continuation_count = 0
-        merge_sign = "" if self.disable_merge_sign else self.config.merge_sign
+    @staticmethod
+    def to_genai_contents(messages: List) -> Tuple[str | None, List[types.Content]]:
+        """Convert LangChain messages to a Gemini system instruction and contents."""
+        from google.genai import types
+        from langchain_core.messages import AIMessage, SystemMessage
         
-        while continuation_count <= self.config.max_continuations:
-            if continuation_count == 0:
-                print(f"\n--- Getting response ---")
-            else:
-                print(f"\n--- Getting response (attempt {continuation_count + 1}) ---")
+        system_instruction = None
+        contents = []
+        
+        for message in messages:
+            if isinstance(message, SystemMessage):
+                system_instruction = message.content
+                continue
             
-            current_response = ""
+            if isinstance(message.content, str):
+                parts = [types.Part.from_text(text=message.content)]
+            else:
+                parts = [
+                    types.Part.from_uri(file_uri=item['file_uri'], mime_type=item['mime_type'])
+                    if item.get('type') == 'media' else types.Part.from_text(text=item['text'])
+                    for item in message.content
+                ]
+            role = 'model' if isinstance(message, AIMessage) else 'user'
+            contents.append(types.Content(role=role, parts=parts))
+        
+        return system_instruction, contents
+    
+    async def create_context_cache(self, messages: List) -> str | None:
+        """Cache the conversation so far on Gemini and return the cache name, or None if unavailable."""
+        if not self.config.use_context_cache:
+            return None
+        from google.genai import types
+        
+        system_instruction, contents = self.to_genai_contents(messages)
+        try:
+            cached_content = await self._get_genai_client().aio.caches.create(
+                model=self.config.model_name,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=system_instruction,
+                    contents=contents,
+                    ttl=self.config.context_cache_ttl
+                )
+            )
+        except Exception as e:
+            # e.g. the context is below the model's minimum cacheable size
+            print(f"[Context caching unavailable, sending full context: {e}]")
+            return None
+        
+        return cached_content.name
+    
+    async def delete_context_cache(self, cache_name: str) -> None:
+        """Delete a cached context so it stops accruing storage cost."""
+        try:
+            await self._get_genai_client().aio.caches.delete(name=cache_name)
+        except Exception as e:
+            print(f"[Failed to delete cached context '{cache_name}': {e}]")
+    
+    async def _astream_model(self, messages: List) -> AsyncIterator[Tuple[str, str]]:
+        """Stream (content, finish_reason) pairs from the LangChain model."""
+        async for chunk in self.model.astream(messages):
+            metadata = getattr(chunk, 'response_metadata', None)
+            finish_reason = metadata.get('finish_reason') if metadata else None
+            yield getattr(chunk, 'content', None) or "", finish_reason or ""
+    
+    async def _astream_cached(self, messages: List, cached_content: str) -> AsyncIterator[Tuple[str, str]]:
+        """Stream (content, finish_reason) pairs from Gemini on top of a cached context."""
+        from google.genai import types
+        
+        _, contents = self.to_genai_contents(messages)
+        stream = await self._get_genai_client().aio.models.generate_content_stream(
+            model=self.config.model_name,
+            contents=contents,
+            config=types.GenerateContentConfig(
+                cached_content=cached_content,
+                temperature=self.config.temperature
+            )
+        )
+        async for chunk in stream:
             finish_reason = ""
-
-            async for chunk in self.model.astream(messages):
-                if hasattr(chunk, 'content') and chunk.content:
-                    print(chunk.content, end="", flush=True)
-                    current_response += chunk.content
-                if hasattr(chunk, 'response_metadata') and chunk.response_metadata:
-                    if 'finish_reason' in chunk.response_metadata:
-                        finish_reason = chunk.response_metadata['finish_reason']
-            
-            complete_response += merge_sign + current_response
-            
-            # Check if the response is complete
-            if not self.is_response_truncated(finish_reason) or continuation_count >= self.config.max_continuations:
-                messages.append(AIMessage(content=complete_response))
-                break
-            
-            # Handle continuation
-            print(f"\n\n[Detected truncated response, requesting continuation...]")
-            continuation_count += 1
-            
-            messages.append(AIMessage(content=current_response))
-            messages.append(HumanMessage(
-                content=Prompts.DEFAULT_CONTINUE_MESSAGE
-            ))
+            if chunk.candidates and chunk.candidates[0].finish_reason:
+                finish_reason = chunk.candidates[0].finish_reason.name
+            yield chunk.text or "", finish_reason
+    
+    async def get_complete_response(self, messages: List, cached_content: str | None = None,
+                                    cached_count: int = 0,
+                                    sink: Callable[[str], object] | None = None) -> Tuple[List, int, int, bool]:
+        """Get a complete response with automatic continuation handling.
+        
+        If `cached_content` is given, the first `cached_count` messages are served
+        from that Gemini context cache and only the rest are sent with each request.
+        Otherwise the context is cached after the first truncation, so continuations
+        don't re-send the audio.
+        If `sink` is given, the response text is passed to it as it streams in.
+        
+        `messages` is extended in place with the complete response as a single
+        AIMessage, and is returned for convenience along with the number of
+        continuations, the number of rounds resumed after a transient error and
+        whether the last round was still truncated.
+        """
+        from langchain_core.messages import AIMessage, HumanMessage
+        
+        history_length = len(messages)
+        complete_parts: List[str] = []
+        continuation_count = 0
+        resume_count = 0
+        retry_count = 0
+        reissued = False
+        resuming = False
+        merge_sign = "" if self.disable_merge_sign else self.config.merge_sign
         
-        if continuation_count > self.config.max_continuations:
-            print(f"\n[Warning: Reached maximum continuation attempts ({self.config.max_continuations}). "
-                  f"Response may still be incomplete.]")
+        # Streamed text is echoed in batches rather than written and flushed per token
+        echo = ConsoleEcho(self.config.echo_flush_chars, self.config.echo_flush_interval) if self.echo else None
+        owned_cache = None
+        cache_attempted = False
+        try:
+            while True:
+                if resuming:
+                    print(f"\n--- Resuming response (retry {retry_count}) ---")
+                elif continuation_count == 0:
+                    print(f"\n--- Getting response ---")
+                else:
+                    print(f"\n--- Getting response (attempt {continuation_count + 1}) ---")
+                
+                current_parts: List[str] = []
+                finish_reason = ""
+                if sink is not None and merge_sign and not reissued:
+                    sink(merge_sign)
+                reissued = False
+                
+                if cached_content is not None:
+                    stream = self._astream_cached(messages[cached_count:], cached_content)
+                else:
+                    stream = self._astream_model(messages)
+                
+                interrupted = False
+                flusher = asyncio.create_task(echo.flush_periodically()) if echo is not None else None
+                try:
+                    async for content, chunk_finish_reason in stream:
+                        if content:
+                            if echo is not None:
+                                echo.write(content)
+                            current_parts.append(content)
+                            if sink is not None:
+                                sink(content)
+                        if chunk_finish_reason:
+                            finish_reason = chunk_finish_reason
+                except Exception as e:
+                    if flusher is not None:
+                        flusher.cancel()
+                    if echo is not None:
+                        echo.flush()
+                    if not self.is_retryable_error(e) or retry_count >= self.config.max_retries:
+                        raise
+                    retry_count += 1
+                    delay = self.get_retry_delay(retry_count)
+                    print(f"\n\n[Transient error: {e}. Retrying in {delay:.1f}s ({retry_count}/{self.config.max_retries})...]")
+                    await asyncio.sleep(delay)
+                    if not current_parts:
+                        # Nothing was streamed, so the same request can simply be re-issued
+                        reissued = True
+                        continue
+                    # Keep what was streamed and resume from it like a truncated response
+                    interrupted = True
+                else:
+                    retry_count = 0
+                finally:
+                    if flusher is not None:
+                        flusher.cancel()
+                    if echo is not None:
+                        echo.flush()
+                
+                current_response = "".join(current_parts)
+                complete_parts.append(merge_sign)
+                complete_parts.append(current_response)
+                
+                # Check if the response is complete; an interrupted round is always resumed,
+                # since running out of retries raises instead of accepting the partial text
+                truncated = finish_reason in TRUNCATED_FINISH_REASONS
+                if not interrupted and (not truncated or continuation_count >= self.config.max_continuations):
+                    # Replace the partial responses and continuation prompts with the joined
+                    # response, so later requests don't carry the text twice
+                    del messages[history_length:]
+                    messages.append(AIMessage(content="".join(complete_parts)))
+                    break
+                
+                # Handle continuation; resuming after an error doesn't use up the continuation budget
+                resuming = interrupted
+                if interrupted:
+                    resume_count += 1
+                else:
+                    print(f"\n\n[Detected truncated response, requesting continuation...]")
+                    continuation_count += 1
+                
+                messages.append(AIMessage(content=current_response))
+                if cached_content is None and not cache_attempted:
+                    # Serve the audio and the partial response from a context cache
+                    # rather than re-sending them with every continuation
+                    cache_attempted = True
+                    cached_content = await self.create_context_cache(messages)
+                    if cached_content is not None:
+                        owned_cache = cached_content
+                        cached_count = len(messages)
+                messages.append(HumanMessage(
+                    content=Prompts.DEFAULT_CONTINUE_MESSAGE
+                ))
+        finally:
+            if owned_cache is not None:
+                await self.delete_context_cache(owned_cache)
         
-        return messages, continuation_count
+        if truncated:
+            print(f"\n[Warning: Response was still truncated ({finish_reason}) after {continuation_count} "
+                  f"continuation attempt(s). Response may be incomplete.]")
+        
+        return messages, continuation_count, resume_count, truncated
     
-    async def transcribe(self, filename: pathlib.Path, system_message: str = None) -> List:
-        """Transcribe the audio file to SRT format."""
+    async def transcribe(self, filename: pathlib.Path, system_message: str = None,
+                         audio_msg: HumanMessage | None = None) -> List:
+        """Transcribe the audio file to SRT format, uploading it first unless `audio_msg` is given."""
+        from langchain_core.messages import AIMessage, SystemMessage
+        
         if system_message is None:
             system_message = Prompts.DEFAULT_SYSTEM_MESSAGE
         separator = self.config.separator
         
         sys_msg = SystemMessage(content=system_message)
-        audio_msg = await self.upload_audio(filename)
+        
+        cache_key = None
+        if self.cache is not None:
+            cache_key = await self.transcript_cache_key(filename, system_message)
+            cached_response = self.cache.get(cache_key)
+            if cached_response is not None:
+                print(f"Using cached transcription for '{filename}'")
+                await self.save_to_srt(cached_response, filename)
+                # The transcript stands in for the audio in the translation context
+                return [sys_msg, AIMessage(content=cached_response)]
+        
+        if audio_msg is None:
+            audio_msg = await self.upload_audio(filename)
         messages = [sys_msg, audio_msg]
         
         print(separator)
         print('Starting transcription...')
         print(separator)
         
-        messages, continuation_count = await self.get_complete_response(messages.copy())
+        # Stream straight to disk so the file can be followed while it is written
+        output_filename = filename.with_suffix(".srt")
+        with open(output_filename, "w", encoding='utf-8', buffering=self.config.srt_buffer_size) as srt_file:
+            messages, continuation_count, resume_count, truncated = await self.get_complete_response(
+                messages, sink=srt_file.write
+            )
         full_response = messages[-1].content
         
-        if continuation_count > 0:
-            print(self.get_warning_message(continuation_count))
+        if continuation_count > 0 or resume_count > 0:
+            print(self.get_warning_message(continuation_count, resume_count=resume_count))
         
         print('\n' + separator)
         print("Transcription complete!")
         
-        await self.save_to_srt(full_response, filename)
+        self.report_saved(output_filename)
+        # An incomplete response is not cached, so a later run gets another chance to complete it
+        if cache_key is not None and not truncated:
+            self.cache.put(cache_key, full_response)
         return messages
     
-    async def translate(self, filename: pathlib.Path, messages: List, target_language: str) -> None:
-        """Translate transcribed content to the target language."""
-        lang_suffix = target_language.lower().replace(' ', '_')
-        output_filename = pathlib.Path(filename.stem + f"_{lang_suffix}")
+    async def translate(self, filename: pathlib.Path, messages: List, target_language: str,
+                        from_audio: bool = False) -> None:
+        """Translate transcribed content to the target language.
+        
+        With `from_audio`, `messages` holds only the system prompt and audio and the
+        translation is produced directly from the audio, without waiting for a transcript.
+        """
+        from langchain_core.messages import HumanMessage
         
-        translation_prompt = Prompts.DEFAULT_TRANSLATION_PROMPT.format(target_language=target_language)
+        srt_filename = self.get_translation_path(filename, target_language)
+        
+        cache_key = None
+        if self.cache is not None:
+            if from_audio:
+                source = await self.transcript_cache_key(filename, messages[0].content)
+            else:
+                source = messages[-1].content
+            cache_key = self.translation_cache_key(source, target_language)
+            cached_response = self.cache.get(cache_key)
+            if cached_response is not None:
+                print(f"Using cached {target_language} translation for '{filename}'")
+                await self.save_to_srt(cached_response, srt_filename, 'Translation')
+                return
+        
+        if from_audio:
+            # A single request; its context is only cached if it needs continuations
+            cached_count, cached_content = 0, None
+            prompt_template = Prompts.DIRECT_TRANSLATION_PROMPT
+        else:
+            # The system prompt, audio and transcript are reused as a cached prefix
+            cached_count = len(messages)
+            cached_content = await self.create_context_cache(messages)
+            prompt_template = Prompts.DEFAULT_TRANSLATION_PROMPT
+        
+        translation_prompt = prompt_template.format(target_language=target_language)
         messages.append(HumanMessage(content=translation_prompt))
         
         print("\nStarting translation...")
         
-        messages, continuation_count = await self.get_complete_response(messages)
+        try:
+            with open(srt_filename, "w", encoding='utf-8', buffering=self.config.srt_buffer_size) as srt_file:
+                messages, continuation_count, resume_count, truncated = await self.get_complete_response(
+                    messages, cached_content, cached_count, srt_file.write
+                )
+        finally:
+            if cached_content is not None:
+                await self.delete_context_cache(cached_content)
         translation_response = messages[-1].content
         
-        if continuation_count > 0:
-            print(self.get_warning_message(continuation_count, 'Translation'))
+        if continuation_count > 0 or resume_count > 0:
+            print(self.get_warning_message(continuation_count, 'Translation', resume_count))
         
         print('\n' + self.config.separator)
         print("Translation complete!")
         
-        await self.save_to_srt(translation_response, output_filename, 'Translation')
+        self.report_saved(srt_filename, 'Translation')
+        if cache_key is not None and not truncated:
+            self.cache.put(cache_key, translation_response)
 
 class ArgumentParser:
     """Handle command line argument parsing."""
@@ -250,7 +680,8 @@ class ArgumentParser:
         parser.add_argument(
             'file',
             type=str,
-            help='Path to the audio file to transcribe'
+            nargs='+',
+            help='Path(s) to the audio file(s) to transcribe'
         )
         
         parser.add_argument(
@@ -267,6 +698,13 @@ class ArgumentParser:
             help='Target language for translation (default: English)'
         )
         
+        parser.add_argument(
+            '--parallel-translate', '-p',
+            action='store_true',
+            dest='parallel_translate',
+            help='Translate directly from the audio, concurrently with the transcription'
+        )
+        
         parser.add_argument(
             '--disable-merge-sign', '-ms',
             action='store_true',
@@ -274,38 +712,143 @@ class ArgumentParser:
             help='Disable showing a merge sign in the output file in case of repeated model runs'
         )
         
-        parser.set_defaults(translate=True, disable_merge_sign=False)
+        parser.add_argument(
+            '--legacy-prompt',
+            action='store_true',
+            dest='legacy_prompt',
+            help='Use the original, longer system prompt instead of the compact default'
+        )
+        
+        parser.add_argument(
+            '--no-cache',
+            dest='use_cache',
+            action='store_false',
+            help='Disable the on-disk cache of previously generated subtitles'
+        )
+        
+        parser.add_argument(
+            '--max-concurrency', '-c',
+            type=ArgumentParser.positive_int,
+            default=5,
+            dest='max_concurrency',
+            help='Maximum number of files processed at the same time, from upload to saved subtitles (default: 5)'
+        )
+        
+        parser.set_defaults(translate=True, parallel_translate=False, disable_merge_sign=False, legacy_prompt=False, use_cache=True)
         return parser
     
     @staticmethod
-    def validate_file_path(file_path: str) -> None:
-        """Validate that the input file exists."""
-        if not pathlib.Path(file_path).exists():
-            print(f"Error: File '{file_path}' does not exist.")
+    def positive_int(value: str) -> int:
+        """Parse a strictly positive integer argument."""
+        number = int(value)
+        if number < 1:
+            raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+        return number
+    
+    @staticmethod
+    def validate_file_path(file_path: str) -> pathlib.Path:
+        """Validate that the input file exists and return it as a path."""
+        try:
+            os.stat(file_path)
+        except OSError as e:
+            # e.g. a missing file, a path through a regular file or a permission error
+            print(f"Error: File '{file_path}' does not exist or is not accessible: {e.strerror}.")
             sys.exit(1)
+        return pathlib.Path(file_path)
+    
+    @staticmethod
+    def validate_output_paths(file_paths: List[pathlib.Path], translate: bool, language: str) -> None:
+        """Check that no two input files write the same subtitle file.
+        
+        Extracted audio is saved next to the video under the same name, so inputs whose
+        subtitles don't collide can't overwrite each other's audio either.
+        """
+        owners = {}
+        for file_path in file_paths:
+            outputs = [file_path.with_suffix(".srt")]
+            if translate:
+                outputs.append(AudioTranscriber.get_translation_path(file_path, language))
+            for output in outputs:
+                owner = owners.setdefault(output.resolve(), file_path)
+                if owner != file_path:
+                    print(f"Error: Files '{owner}' and '{file_path}' would both be saved to '{output}'.")
+                    sys.exit(1)
+
+async def upload_file(transcriber: AudioTranscriber, file_path: pathlib.Path,
+                      system_message: str = None) -> Tuple[pathlib.Path, HumanMessage | None]:
+    """Prepare a single file and upload its audio, unless its transcription is already cached."""
+    audio_path = await AudioTranscriber.prepare_file(file_path)
+    if await transcriber.is_transcript_cached(audio_path, system_message):
+        return audio_path, None
+    return audio_path, await transcriber.upload_audio(audio_path)
+
+async def process_file(transcriber: AudioTranscriber, audio_path: pathlib.Path, audio_msg: HumanMessage | None,
+                       translate: bool, language: str, system_message: str = None,
+                       parallel_translate: bool = False) -> None:
+    """Transcribe a single uploaded file and optionally translate the result."""
+    if system_message is None:
+        system_message = Prompts.DEFAULT_SYSTEM_MESSAGE
+    
+    # Without an uploaded audio message the transcript is cached, so translate from it instead
+    if translate and parallel_translate and audio_msg is not None:
+        from langchain_core.messages import SystemMessage
+        translation_messages = [SystemMessage(content=system_message), audio_msg]
+        await asyncio.gather(
+            transcriber.transcribe(audio_path, system_message, audio_msg),
+            transcriber.translate(audio_path, translation_messages, language, from_audio=True)
+        )
+        return
+    
+    messages = await transcriber.transcribe(audio_path, system_message, audio_msg)
+    
+    if translate:
+        await transcriber.translate(audio_path, messages, language)
+    else:
+        print("Skipping translation due to --no-translate flag.\n\n")
 
 async def main() -> None:
     """Main application entry point."""
     parser = ArgumentParser.create_parser()
     args = parser.parse_args()
     
-    ArgumentParser.validate_file_path(args.file)
+    file_paths = [ArgumentParser.validate_file_path(p) for p in args.file]
+    # The same file given twice is only processed once
+    file_paths = list({p.resolve(): p for p in file_paths}.values())
+    ArgumentParser.validate_output_paths(file_paths, args.translate, args.language)
     
-    # Initialize transcriber
+    # Initialize a single transcriber shared by all files;
+    # streamed output is only echoed when it can't interleave
     config = TranscriptionConfig()
-    transcriber = AudioTranscriber(config, args.disable_merge_sign)
+    echo = (len(file_paths) == 1 or args.max_concurrency == 1) and not (args.translate and args.parallel_translate)
+    cache = DiskCache() if args.use_cache else None
+    transcriber = AudioTranscriber(config, args.disable_merge_sign, echo, cache)
+    system_message = Prompts.LEGACY_SYSTEM_MESSAGE if args.legacy_prompt else Prompts.DEFAULT_SYSTEM_MESSAGE
+    semaphore = asyncio.Semaphore(args.max_concurrency)
     
-    # Prepare file and transcribe
-    processed_file = AudioTranscriber.prepare_file(args.file)
-    file_path = pathlib.Path(processed_file)
+    # Each file holds its slot from upload to the end of its model calls, so no more than
+    # `max_concurrency` files are in flight and uploads never run far ahead of transcription
+    async def run_one(file_path: pathlib.Path) -> None:
+        async with semaphore:
+            audio_path, audio_msg = await upload_file(transcriber, file_path, system_message)
+            await process_file(transcriber, audio_path, audio_msg, args.translate, args.language,
+                               system_message, args.parallel_translate)
     
-    messages = await transcriber.transcribe(file_path)
-    
-    # Handle translation
-    if args.translate:
-        await transcriber.translate(file_path, messages, args.language)
+    # One failing file shouldn't abort the rest of the batch
+    results = await asyncio.gather(*(run_one(p) for p in file_paths), return_exceptions=True)
+    failures = [(p, r) for p, r in zip(file_paths, results) if isinstance(r, BaseException)]
+    for file_path, error in failures:
+        print(f"Error: Processing '{file_path}' failed: {error}")
+    if failures:
+        sys.exit(1)
+
+def run() -> None:
+    """Run the application, on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
     else:
-        print("Skipping translation due to --no-translate flag.\n\n")
+        uvloop.run(main())
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
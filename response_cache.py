@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import mmap
+import os
+import pathlib
+import sqlite3
+import time
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def default_cache_dir() -> pathlib.Path:
+    """Return the per-user cache directory for generated subtitles."""
+    base = os.environ.get('XDG_CACHE_HOME') or pathlib.Path.home() / '.cache'
+    return pathlib.Path(base) / 'smartsubs'
+
+
+def text_sha256(text: str) -> str:
+    """Return the hex SHA-256 digest of a string."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def file_sha256(file_path: str | pathlib.Path) -> str:
+    """Return the hex SHA-256 digest of a file, hashed through mmap in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                for offset in range(0, size, HASH_CHUNK_SIZE):
+                    digest.update(view[offset:offset + HASH_CHUNK_SIZE])
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=1024)
+def _file_digest(file_path: str, mtime_ns: int, size: int) -> str:
+    return file_sha256(file_path)
+
+
+def file_digest(file_path: str | pathlib.Path) -> str:
+    """Return the hex SHA-256 digest of a file, computed once per version of the file."""
+    stat = os.stat(file_path)
+    return _file_digest(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+class DiskCache:
+    """Content-addressed cache of generated SRT responses stored in a SQLite database.
+
+    The cache is only an optimization, so database and file system errors are
+    reported and treated as a miss or a skipped write.
+    """
+
+    FILENAME = 'cache.sqlite'
+    DEFAULT_TTL = 30 * 24 * 60 * 60
+
+    def __init__(self, directory: pathlib.Path | None = None, max_entries: int = 256,
+                 ttl: float | None = DEFAULT_TTL, timeout: float = 10.0):
+        self.directory = directory or default_cache_dir()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Seconds to wait for a lock held by another run before giving up
+        self.timeout = timeout
+        self._connection: sqlite3.Connection | None = None
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the parts identifying a response."""
+        return text_sha256('\0'.join(parts))
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use, creating it if needed."""
+        if self._connection is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.directory / self.FILENAME, timeout=self.timeout)
+            try:
+                with connection:
+                    connection.execute(
+                        'CREATE TABLE IF NOT EXISTS responses ('
+                        'key TEXT PRIMARY KEY, srt BLOB NOT NULL, '
+                        'created_at INTEGER NOT NULL, accessed_at REAL NOT NULL)'
+                    )
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response for `key`, or None on a miss, expired entry or error."""
+        try:
+            return self._get(key)
+        except (OSError, sqlite3.Error) as e:
+            print(f"[Subtitle cache unavailable, treating as a miss: {e}]")
+            return None
+
+    def _get(self, key: str) -> str | None:
+        connection = self._connect()
+        row = connection.execute('SELECT srt, created_at FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+
+        srt, created_at = row
+        now = time.time()
+        with connection:
+            if self.ttl is not None and now - created_at > self.ttl:
+                connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+                return None
+            # Mark the entry as recently used for LRU trimming
+            connection.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+        return srt.decode('utf-8')
+
+    def put(self, key: str, content: str) -> None:
+        """Store a response under `key` and trim expired and least recently used entries."""
+        try:
+            self._put(key, content)
+        except (OSError, sqlite3.Error) as e:
+            print(f"[Subtitle cache unavailable, response not cached: {e}]")
+
+    def _put(self, key: str, content: str) -> None:
+        connection = self._connect()
+        now = time.time()
+        with connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO responses (key, srt, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, content.encode('utf-8'), int(now), now)
+            )
+            if self.ttl is not None:
+                connection.execute('DELETE FROM responses WHERE created_at < ?', (now - self.ttl,))
+            connection.execute(
+                'DELETE FROM responses WHERE key NOT IN '
+                '(SELECT key FROM responses ORDER BY accessed_at DESC LIMIT ?)',
+                (self.max_entries,)
+            )
+
+    def close(self) -> None:
+        """Close the database connection, if open."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
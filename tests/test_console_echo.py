@@ -0,0 +1,27 @@
+import asyncio
+
+from main import ConsoleEcho
+
+
+def test_write_buffers_until_max_chars(capsys):
+    echo = ConsoleEcho(max_chars=10, interval=60)
+
+    echo.write('12345')
+    assert capsys.readouterr().out == ''
+    echo.write('67890')
+    assert capsys.readouterr().out == '1234567890'
+
+
+def test_flush_periodically_writes_pending_text_during_pauses(capsys):
+    echo = ConsoleEcho(max_chars=1000, interval=0.01)
+
+    async def stream():
+        flusher = asyncio.create_task(echo.flush_periodically())
+        echo.write('streamed')
+        # The stream pauses; pending text must still be shown
+        await asyncio.sleep(0.05)
+        output = capsys.readouterr().out
+        flusher.cancel()
+        return output
+
+    assert asyncio.run(stream()) == 'streamed'
@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage
+
+import main
+from main import MERGE_SIGN, AudioTranscriber, Prompts, TranscriptionConfig
+
+
+class TransientError(Exception):
+    code = 503
+
+
+class FakeModel:
+    """Chat model whose `astream` replays a script of rounds.
+
+    Each round is a list of (content, finish_reason) pairs, or exceptions raised mid-stream.
+    """
+
+    def __init__(self, rounds):
+        self.rounds = list(rounds)
+        self.calls = []
+
+    async def astream(self, messages):
+        self.calls.append(list(messages))
+        for item in self.rounds.pop(0):
+            if isinstance(item, Exception):
+                raise item
+            content, finish_reason = item
+            yield AIMessageChunk(content=content, response_metadata={'finish_reason': finish_reason})
+
+
+def make_transcriber(monkeypatch, rounds, disable_merge_sign=False, **config):
+    model = FakeModel(rounds)
+    monkeypatch.setattr(main, 'get_model', lambda model_name, temperature: model)
+    config = TranscriptionConfig(use_context_cache=False, retry_max_delay=0, **config)
+    return AudioTranscriber(config, disable_merge_sign, echo=False), model
+
+
+def run(transcriber, messages):
+    written = []
+    result = asyncio.run(transcriber.get_complete_response(messages, sink=written.append))
+    return result, "".join(written)
+
+
+def initial_messages():
+    return [SystemMessage(content='system'), HumanMessage(content='audio')]
+
+
+def test_reissues_request_when_nothing_was_streamed(monkeypatch):
+    transcriber, model = make_transcriber(monkeypatch, [
+        [TransientError('unavailable')],
+        [('complete', 'STOP')],
+    ])
+
+    (messages, continuation_count, resume_count, truncated), written = run(transcriber, initial_messages())
+
+    assert (continuation_count, resume_count, truncated) == (0, 0, False)
+    assert messages[-1].content == MERGE_SIGN + 'complete'
+    assert written == messages[-1].content
+    assert model.calls[0] == model.calls[1]
+
+
+def test_resumes_after_partial_content(monkeypatch):
+    transcriber, model = make_transcriber(monkeypatch, [
+        [('part 1', ''), TransientError('connection reset')],
+        [('part 2', 'STOP')],
+    ])
+
+    (messages, continuation_count, resume_count, truncated), written = run(transcriber, initial_messages())
+
+    assert (continuation_count, resume_count, truncated) == (0, 1, False)
+    assert messages[-1].content == MERGE_SIGN + 'part 1' + MERGE_SIGN + 'part 2'
+    assert model.calls[1][-2:] == [AIMessage(content='part 1'), HumanMessage(content=Prompts.DEFAULT_CONTINUE_MESSAGE)]
+
+
+def test_resume_does_not_use_continuation_budget(monkeypatch):
+    transcriber, _ = make_transcriber(monkeypatch, [
+        [('part 1', 'MAX_TOKENS')],
+        [('part 2', ''), TransientError('connection reset')],
+        [('part 3', 'STOP')],
+    ], max_continuations=1)
+
+    (messages, continuation_count, resume_count, truncated), _ = run(transcriber, initial_messages())
+
+    assert (continuation_count, resume_count, truncated) == (1, 1, False)
+    assert messages[-1].content.endswith('part 3')
+
+
+def test_raises_when_retries_are_exhausted(monkeypatch):
+    transcriber, model = make_transcriber(monkeypatch, [
+        [TransientError('unavailable')],
+        [('partial', ''), TransientError('unavailable')],
+        [TransientError('unavailable')],
+    ], max_retries=2)
+
+    with pytest.raises(TransientError):
+        run(transcriber, initial_messages())
+    assert len(model.calls) == 3
+
+
+def test_raises_non_retryable_errors_immediately(monkeypatch):
+    transcriber, model = make_transcriber(monkeypatch, [[ValueError('bad request')]])
+
+    with pytest.raises(ValueError):
+        run(transcriber, initial_messages())
+    assert len(model.calls) == 1
+
+
+@pytest.mark.parametrize('disable_merge_sign', [False, True])
+def test_sink_matches_returned_message(monkeypatch, disable_merge_sign):
+    transcriber, _ = make_transcriber(monkeypatch, [
+        [('1\n', ''), ('00:00:01 --> 00:00:02\n', 'MAX_TOKENS')],
+        [TransientError('unavailable')],
+        [('Hello', ''), TransientError('connection reset')],
+        [(' world\n', 'STOP')],
+    ], disable_merge_sign=disable_merge_sign)
+
+    messages = initial_messages()
+    (returned, continuation_count, resume_count, truncated), written = run(transcriber, messages)
+
+    assert returned is messages
+    assert len(messages) == 3 and isinstance(messages[-1], AIMessage)
+    assert written == messages[-1].content
+    assert (continuation_count, resume_count, truncated) == (1, 1, False)
+
+
+def test_reports_response_still_truncated_at_limit(monkeypatch):
+    transcriber, _ = make_transcriber(monkeypatch, [
+        [('part 1', 'MAX_TOKENS')],
+        [('part 2', 'SAFETY')],
+    ], max_continuations=1)
+
+    (messages, continuation_count, resume_count, truncated), written = run(transcriber, initial_messages())
+
+    assert (continuation_count, resume_count, truncated) == (1, 0, True)
+    assert written == messages[-1].content
@@ -0,0 +1,128 @@
+import hashlib
+import os
+import sqlite3
+
+import pytest
+
+import response_cache
+from response_cache import DiskCache, file_digest
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(response_cache.time, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = DiskCache(tmp_path / 'cache', max_entries=2, ttl=100)
+    yield cache
+    cache.close()
+
+
+def test_get_returns_stored_response(cache):
+    assert cache.get('missing') is None
+    cache.put('key', 'サブタイトル')
+    assert cache.get('key') == 'サブタイトル'
+
+
+def test_put_evicts_least_recently_used(cache, clock):
+    cache.put('a', 'A')
+    clock.now += 0.001
+    cache.put('b', 'B')
+    clock.now += 0.001
+    # Reading `a` makes `b` the least recently used entry
+    assert cache.get('a') == 'A'
+    clock.now += 0.001
+    cache.put('c', 'C')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 'A'
+    assert cache.get('c') == 'C'
+
+
+def test_get_drops_expired_entry(cache, clock):
+    cache.put('key', 'value')
+    clock.now += 101
+
+    assert cache.get('key') is None
+    clock.now -= 101
+    assert cache.get('key') is None
+
+
+def test_put_trims_expired_entries(cache, clock):
+    cache.put('old', 'value')
+    clock.now += 101
+    cache.put('new', 'value')
+
+    rows = cache._connect().execute('SELECT key FROM responses').fetchall()
+    assert rows == [('new',)]
+
+
+def test_unusable_directory_is_a_miss(tmp_path, capsys):
+    blocker = tmp_path / 'file'
+    blocker.write_text('not a directory')
+    cache = DiskCache(blocker / 'cache')
+
+    assert cache.get('key') is None
+    cache.put('key', 'value')
+    assert 'Subtitle cache unavailable' in capsys.readouterr().out
+
+
+def test_locked_database_is_skipped(tmp_path, capsys):
+    cache = DiskCache(tmp_path, timeout=0.05)
+    cache.put('key', 'value')
+    other = DiskCache(tmp_path, timeout=0.05)
+    lock = sqlite3.connect(tmp_path / DiskCache.FILENAME)
+    lock.execute('BEGIN EXCLUSIVE')
+    try:
+        other.put('other', 'value')
+        assert other.get('key') is None
+    finally:
+        lock.rollback()
+        lock.close()
+
+    assert 'database is locked' in capsys.readouterr().out
+    assert other.get('key') == 'value'
+    cache.close()
+    other.close()
+
+
+def test_file_digest_is_memoized_per_file_version(tmp_path, monkeypatch):
+    calls = []
+    file_sha256 = response_cache.file_sha256
+
+    def counting_file_sha256(path):
+        calls.append(path)
+        return file_sha256(path)
+
+    monkeypatch.setattr(response_cache, 'file_sha256', counting_file_sha256)
+    response_cache._file_digest.cache_clear()
+    audio = tmp_path / 'audio.mp3'
+    audio.write_bytes(b'first')
+
+    assert file_digest(audio) == hashlib.sha256(b'first').hexdigest()
+    assert file_digest(audio) == hashlib.sha256(b'first').hexdigest()
+    assert len(calls) == 1
+
+    audio.write_bytes(b'second!')
+    stat = os.stat(audio)
+    os.utime(audio, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert file_digest(audio) == hashlib.sha256(b'second!').hexdigest()
+    assert len(calls) == 2
+
+
+def test_file_sha256_of_empty_file(tmp_path):
+    empty = tmp_path / 'empty'
+    empty.touch()
+    assert response_cache.file_sha256(empty) == hashlib.sha256().hexdigest()
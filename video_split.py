@@ -1,5 +1,10 @@
-from av import open
-from pathlib import PurePath
+import os
+from functools import lru_cache
+
+SNIFF_SIZE = 4096
+MUX_BATCH_SIZE = 256
+AUDIO_EXTENSIONS = {'.mp3', '.aac', '.wav', '.flac', '.ogg', '.opus', '.m4a', '.ac3'}
+VIDEO_EXTENSIONS = {'.mp4', '.mkv', '.mov', '.webm', '.avi', '.ts', '.flv'}
 extension_map = {
     'aac': 'aac',
     'mp3': 'mp3',
@@ -11,51 +16,99 @@ extension_map = {
 }
 
 
-# noinspection PyInconsistentReturns
+def probe(file_path):
+    # Open the container once for everything prepare_file needs to know
+    import av
+    with av.open(file_path, 'r') as container:
+        has_video = bool(container.streams.video)
+        audio_codec = container.streams.audio[0].codec_context.name if container.streams.audio else None
+    return has_video, audio_codec
+
+
 def detect_video(file_path):
-    with open(file_path, 'r') as container:
-        if container.streams.video:
-            return True
-        else:
-            return False
+    return probe(file_path)[0]
+
+
+def sniff_audio_only(header):
+    # Signatures of formats that can only carry audio
+    if header.startswith((b'ID3', b'fLaC', b'\x0b\x77')):
+        return True
+    if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+        return True
+    # Raw MPEG audio / ADTS AAC frame sync
+    if len(header) >= 2 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0:
+        return True
+    return False
+
+
+@lru_cache(maxsize=1024)
+def _probe_file(file_path, mtime_ns, size, sniff):
+    if sniff:
+        with open(file_path, 'rb') as f:
+            header = f.read(SNIFF_SIZE)
+        if sniff_audio_only(header):
+            return False, None
+    return probe(file_path)
+
+
+def probe_file(file_path):
+    # Known audio extensions need no I/O at all, known video extensions skip the header sniff
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in AUDIO_EXTENSIONS:
+        return False, None
+    # Cached per file version, only opens the container when the header is inconclusive
+    sniff = extension not in VIDEO_EXTENSIONS
+    stat = os.stat(file_path)
+    return _probe_file(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, sniff)
 
 
 def get_audio_codec(video_path):
-    with open(video_path, 'r') as container:
-        if not container.streams.audio:
-            raise Exception("No audio streams found")
-        audio_stream = container.streams.audio[0]
-    codec_context = audio_stream.codec_context
-    codec_name = codec_context.name
-    return codec_name
+    audio_codec = probe(video_path)[1]
+    if audio_codec is None:
+        raise Exception("No audio streams found")
+    return audio_codec
 
 
 def get_output_extension(codec_name):
     return extension_map.get(codec_name, codec_name)
 
 
-def get_output_path(video_path):
-    audio_codec = get_audio_codec(video_path)
+def get_output_path(video_path, audio_codec=None):
+    if audio_codec is None:
+        audio_codec = get_audio_codec(video_path)
     output_extension = get_output_extension(audio_codec)
-    output_path_object = PurePath(video_path).with_suffix(f".{output_extension}")
-    output_path = str(output_path_object)
-    return output_path
+    # Plain string split instead of building PurePath objects, splitext ignores dots in directory names
+    base, _ = os.path.splitext(os.fspath(video_path))
+    return f"{base}.{output_extension}"
 
 
 def extract_audio(video_path, audio_path):
+    import av
     print(f"Extracting audio to '{audio_path}'...")
     try:
-        input_container = open(video_path, 'r')
-        output_container = open(audio_path, 'w')
-        input_stream = input_container.streams.audio[0]
-        output_stream = output_container.add_stream_from_template(input_stream)
-        for packet in input_container.demux(input_stream):
-            if packet.dts is None:
-                continue
-            packet.stream = output_stream
-            output_container.mux(packet)
-        input_container.close()
-        output_container.close()
+        with av.open(video_path, 'r') as input_container:
+            in_stream = input_container.streams.audio[0]
+            try:
+                with av.open(audio_path, 'w') as output_container:
+                    out_stream = output_container.add_stream_from_template(in_stream)
+                    mux = output_container.mux
+                    # mux() accepts a sequence, so packets cross into PyAV in batches
+                    batch = []
+                    for packet in input_container.demux(in_stream):
+                        if packet.dts is None:
+                            continue
+                        packet.stream = out_stream
+                        batch.append(packet)
+                        if len(batch) >= MUX_BATCH_SIZE:
+                            mux(batch)
+                            batch = []
+                    if batch:
+                        mux(batch)
+            except BaseException:
+                # Don't leave a truncated audio file behind
+                if os.path.exists(audio_path):
+                    os.remove(audio_path)
+                raise
         return True
     except FileNotFoundError:
         print(f"Error: File '{video_path}' not found.")
@@ -65,4 +118,4 @@ def extract_audio(video_path, audio_path):
         return False
     except Exception as e:
         print(f"An error occurred during extraction: {e}")
-        return False
\ No newline at end of file
+        return False